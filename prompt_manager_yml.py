@@ -32,14 +32,29 @@ Key Features
          description: "Greeting message used after signup"
 
 3. Parameter Substitution
-   - Render prompts using `template.format(**params)`.
+   - Render prompts using `template.format(**params)` semantics.
+   - Templates made of plain `{name}` placeholders are compiled once into a
+     specialised render function, so rendering skips the format() parse.
    - Supports strict mode:
        * strict=True  → missing parameters raise PromptRenderError
        * strict=False → missing placeholders remain as {placeholder}
 
 4. Caching
    - Loaded templates are cached in memory to avoid repeated disk reads.
-   - Cache can be invalidated using `clear_cache()`.
+     Pass maxsize=N to keep only the N most recently used; `cache_info()`
+     reports hits, misses and the current size.
+   - `preload()` warms the cache for many prompts at once, reading the files
+     concurrently from a thread pool, or with batched io_uring submissions
+     when created with use_uring=True (Linux + the optional `liburing` package;
+     not combined with disk_cache, which always uses the thread pool).
+   - With check_mtime=True, each cache hit stats the prompt file and reloads
+     only that prompt when its mtime changed.
+   - Cache can be invalidated using `clear_cache()`, which also rescans the
+     folder; lookups use an index built at start-up, and files added later
+     are still found on demand.
+   - Optionally (disk_cache=True), extracted templates are persisted to
+     `<folder>/.cache/<name>.json` keyed by the YAML file's mtime, so fresh
+     processes skip YAML parsing for unchanged prompts.
 
 5. Error Handling
    - PromptNotFoundError: file does not exist
@@ -71,11 +86,72 @@ Intended Use Cases
 
 from __future__ import annotations
 
+import errno
+import json
+import os
+import stat
+import sys
+import tempfile
+import threading
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from string import Formatter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
 import yaml
 
+try:
+    # libyaml-backed loader: same safe semantics, parses many times faster.
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _SafeLoader
+
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+except ImportError:  # orjson is optional; stdlib json is the fallback
+    _json_loads = json.loads
+
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+_DISK_CACHE_DIR = ".cache"
+
+# Errors that mean "no prompt file at this path" (missing, a directory, a path
+# component that is a file, a symlink loop, a name too long). Anything else,
+# e.g. EMFILE or EIO, is a real failure and propagates.
+_NOT_A_FILE_ERRNOS = frozenset(
+    (errno.ENOENT, errno.ENOTDIR, errno.EISDIR, errno.ELOOP, errno.ENAMETOOLONG)
+)
+
+_FORMATTER = Formatter()
+
+# Used to confirm that a plain scalar would load as a string (not an int,
+# bool, null, date, ...) when YAML parsing is skipped.
+_RESOLVER = yaml.resolver.Resolver()
+_STR_TAG = "tag:yaml.org,2002:str"
+# Implicit tags accepted for metadata values the fast path otherwise ignores;
+# others (timestamps, `<<`, `=`) are left to the parser. Values are still
+# constructed, since e.g. `0x_` resolves to int but fails to load.
+_SCALAR_TAGS = frozenset(
+    "tag:yaml.org,2002:" + t for t in ("str", "int", "float", "bool", "null")
+)
+_CONSTRUCTOR = yaml.constructor.SafeConstructor()
+# Characters that give a scalar special meaning when they start it.
+_INDICATORS = frozenset("-?:,[]{}#&*!|>'\"%@`")
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+# Upper bound on reads submitted per io_uring batch (the ring's queue depth).
+_URING_ENTRIES = 256
+
+# A compiled template: its placeholder names (an insertion-ordered dict used as
+# a set) and a generated function that renders it from a params dict.
+_Program = Tuple[Dict[str, None], Callable[[Dict[str, Any]], str]]
+
 
 class PromptNotFoundError(FileNotFoundError):
     """Raised when a prompt file is not found."""
@@ -85,6 +161,296 @@ class PromptRenderError(ValueError):
     """Raised when there is an error rendering a prompt (e.g., missing params)."""
 
 
+class _PassthroughDict(dict):
+    """format_map() mapping that renders unknown keys back as `{key}`."""
+
+    __slots__ = ()
+
+    def __missing__(self, key: str) -> str:
+        return "{" + key + "}"
+
+
+def _compile_template(template: str, name: str, strict: bool) -> Optional[_Program]:
+    """
+    Generate a render function specialised for one template.
+
+    The template is unrolled into a single expression, e.g. "Hi {user}!" becomes
+    ``''.join(('Hi ', _fmt(p['user']), '!'))``, where ``_fmt`` is the builtin
+    format(), just as str.format renders a field without a spec. In non-strict
+    mode each lookup is ``p.get('user', '{user}')`` so missing placeholders are
+    left as-is.
+
+    Returns None if the template uses anything beyond plain `{name}` fields
+    (format specs, conversions, attribute/index access, positional fields) or
+    is malformed; such templates are rendered with str.format instead.
+    """
+    parts: List[str] = []
+    required: Dict[str, None] = {}
+    try:
+        for literal, field, spec, conversion in _FORMATTER.parse(template):
+            if field is not None and (spec or conversion or not field.isidentifier()):
+                return None
+            if literal:
+                parts.append(repr(literal))
+            if field is None:
+                continue
+            required[field] = None
+            if strict:
+                parts.append(f"_fmt(p[{field!r}])")
+            else:
+                parts.append(f"_fmt(p.get({field!r}, {'{' + field + '}'!r}))")
+    except ValueError:
+        return None
+
+    if not parts:
+        body = "''"
+    elif len(parts) == 1:
+        body = parts[0]
+    else:
+        body = "''.join((" + ", ".join(parts) + "))"
+    source = f"def _render(p, _fmt=format):\n    return {body}\n"
+
+    namespace: Dict[str, Any] = {}
+    exec(compile(source, f"<prompt:{name}>", "exec"), namespace)
+    return required, namespace["_render"]
+
+
+def _read_files_uring(paths: List[str]) -> Optional[List[Optional[bytes]]]:
+    """
+    Read whole files using batched io_uring read submissions.
+
+    Files are opened synchronously; the reads for up to `_URING_ENTRIES` files
+    are then submitted with a single syscall and their completions drained.
+    Files that no longer exist (or are no longer files) come back as None.
+    Returns None if io_uring cannot be used here (non-Linux, `liburing` not
+    installed, or ring setup refused by the kernel).
+    """
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        import liburing
+    except ImportError:
+        return None
+
+    entries = min(len(paths), _URING_ENTRIES)
+    ring = liburing.Ring()
+    cqe = liburing.Cqe()
+    try:
+        liburing.io_uring_queue_init(entries, ring)
+    except OSError:
+        return None
+
+    contents: List[Optional[bytes]] = []
+    try:
+        for start in range(0, len(paths), entries):
+            batch = paths[start:start + entries]
+            fds: List[int] = []
+            try:
+                buffers: List[Optional[bytearray]] = []
+                for path in batch:
+                    try:
+                        fd = os.open(path, os.O_RDONLY)
+                    except OSError as e:
+                        if e.errno not in _NOT_A_FILE_ERRNOS:
+                            raise
+                        fds.append(-1)
+                        buffers.append(None)
+                        continue
+                    fds.append(fd)
+                    buffers.append(bytearray(os.fstat(fd).st_size))
+
+                submitted = 0
+                for i, (fd, buf) in enumerate(zip(fds, buffers)):
+                    if buf is None:
+                        continue
+                    sqe = liburing.io_uring_get_sqe(ring)
+                    liburing.io_uring_prep_read(sqe, fd, buf, 0)
+                    liburing.io_uring_sqe_set_data64(sqe, i)
+                    submitted += 1
+                liburing.io_uring_submit(ring)
+
+                # Drain every completion before acting on errors: the kernel
+                # owns the buffers until their read has completed.
+                results = [0] * len(batch)
+                for _ in range(submitted):
+                    liburing.io_uring_wait_cqe(ring, cqe)
+                    done = cqe[0]
+                    try:
+                        res = done.res
+                    except OSError as e:
+                        # The bindings raise a failed completion's error
+                        # instead of returning -errno.
+                        res = -e.errno
+                    results[done.user_data] = res
+                    liburing.io_uring_cqe_seen(ring, done)
+            finally:
+                for fd in fds:
+                    if fd >= 0:
+                        os.close(fd)
+
+            for path, buf, res in zip(batch, buffers, results):
+                if buf is None:
+                    contents.append(None)
+                    continue
+                if res < 0:
+                    if -res in _NOT_A_FILE_ERRNOS:  # e.g. replaced by a directory
+                        contents.append(None)
+                        continue
+                    raise OSError(-res, os.strerror(-res), path)
+                contents.append(bytes(buf[:res]))
+    finally:
+        liburing.io_uring_queue_exit(ring)
+    return contents
+
+
+def _is_simple_plain(text: str) -> bool:
+    """Check that `text` is, on its own, a complete single-line plain YAML scalar."""
+    return not (
+        not text
+        or text[0] in _INDICATORS
+        or text.startswith("...")
+        or not text.isprintable()  # also rejects tabs and exotic line breaks
+        or ": " in text
+        or " #" in text
+        or text.endswith(":")
+    )
+
+
+def _plain_scalar(text: str) -> Optional[str]:
+    """
+    Return `text` if YAML would load it, as a single-line plain scalar, to the
+    identical string; None if it might mean anything else (or anything more).
+    """
+    if not _is_simple_plain(text):
+        return None
+    if _RESOLVER.resolve(yaml.ScalarNode, text, (True, False)) != _STR_TAG:
+        return None
+    return text
+
+
+def _loads_as_scalar(text: str) -> bool:
+    """Check that a single-line plain scalar would load without error."""
+    tag = _RESOLVER.resolve(yaml.ScalarNode, text, (True, False))
+    if tag not in _SCALAR_TAGS:
+        return False
+    try:
+        _CONSTRUCTOR.yaml_constructors[tag](_CONSTRUCTOR, yaml.ScalarNode(tag, text))
+    except (ValueError, yaml.YAMLError):
+        return False
+    return True
+
+
+def _quoted_scalar(text: str) -> Optional[str]:
+    """
+    Decode a single-line quoted YAML scalar that needs no escape processing
+    ('it''s' is fine, "\\n" is not); None if `text` is not one.
+    """
+    if len(text) < 2 or text[0] not in "\"'" or text[-1] != text[0]:
+        return None
+    inner = text[1:-1]
+    if text[0] == '"':
+        return None if '"' in inner or "\\" in inner else inner
+    unescaped = inner.replace("''", "'")
+    return None if "'" in inner.replace("''", "") else unescaped
+
+
+def _decode_prompt(content: bytes) -> Optional[str]:
+    """Decode a prompt file for the fast paths; None leaves it to the parser."""
+    if content.startswith(b"\xef\xbb\xbf"):
+        return None
+    try:
+        return content.decode("utf-8").replace("\r\n", "\n")
+    except UnicodeDecodeError:
+        return None
+
+
+def _sniff_plain_document(content: bytes) -> Optional[str]:
+    """
+    Fast path for prompt files that are just one line of text, optionally after
+    a `---` marker. Returns the template without running the YAML parser, or
+    None when the file needs the real parser (multi-line text is folded by
+    YAML, so it is left to the parser too).
+    """
+    text = _decode_prompt(content)
+    if text is None:
+        return None
+
+    lines = [line.rstrip(" ") for line in text.split("\n")]
+    lines = [line for line in lines if line]
+    # Only an unindented `---` is a document marker; `  ---` is text.
+    if lines and lines[0] == "---":
+        del lines[0]
+    if len(lines) != 1:
+        return None
+    return _plain_scalar(lines[0].lstrip(" "))
+
+
+def _sniff_template_key(content: bytes) -> Optional[str]:
+    """
+    Fast path for mapping-form prompt files whose `template:` value is a
+    single-line plain or quoted scalar. Walks the top-level lines instead of
+    running the YAML parser; returns None (use the parser) as soon as the file
+    contains anything this scan can't vouch for: nested collections, flow or
+    multi-line values, escapes, tabs, anchors, tags, extra documents...
+    Block scalars (| or >) under other keys, e.g. a long description, are fine.
+    """
+    text = _decode_prompt(content)
+    if text is None:
+        return None
+
+    template: Optional[str] = None
+    started = False      # seen a key or the '---' marker
+    in_block = False     # inside the indented body of a | or > block scalar
+    block_indent = 0
+    for line in text.split("\n"):
+        if not line:
+            continue
+        if not line.isprintable() or not line.strip(" "):
+            return None
+
+        if line[0] == " ":
+            if not in_block:
+                return None
+            indent = len(line) - len(line.lstrip(" "))
+            if not block_indent:
+                block_indent = indent
+            elif indent < block_indent:
+                return None
+            continue
+        in_block = False
+        block_indent = 0
+
+        if line[0] == "#":
+            continue
+        if line == "---" and not started:
+            started = True
+            continue
+        started = True
+
+        key, sep, rest = line.partition(":")
+        if not sep or not key.replace("-", "_").isidentifier() or rest[:1] not in ("", " "):
+            return None
+        value = rest.strip(" ")
+
+        if key == "template":
+            if template is not None:
+                return None
+            if value[:1] in ("'", '"'):
+                template = _quoted_scalar(value)
+            else:
+                template = _plain_scalar(value)
+            if template is None:
+                return None
+        elif value in ("|", "|-", "|+", ">", ">-", ">+"):
+            in_block = True
+        elif value[:1] in ("'", '"'):
+            if _quoted_scalar(value) is None:
+                return None
+        elif value and not (_is_simple_plain(value) and _loads_as_scalar(value)):
+            return None
+    return template
+
+
 class PromptManager:
     """
     Manages loading prompt templates from a folder of YAML files and rendering them.
@@ -108,20 +474,73 @@ class PromptManager:
         description: "Basic welcome message"
     """
 
-    def __init__(self, folder: str | Path, strict: bool = True) -> None:
+    def __init__(
+        self,
+        folder: str | Path,
+        strict: bool = True,
+        disk_cache: bool = False,
+        use_uring: bool = False,
+        maxsize: Optional[int] = None,
+        check_mtime: bool = False,
+    ) -> None:
         """
         :param folder: Path to the folder containing prompt YAML files.
         :param strict: If True, missing parameters raise errors.
                        If False, missing params are left as {placeholder}.
+        :param disk_cache: If True, persist extracted templates to
+                           `<folder>/.cache/` and reuse them across processes
+                           while the YAML file's mtime is unchanged.
+        :param use_uring: If True, preload() reads files with batched io_uring
+                          submissions (Linux, requires the `liburing` package),
+                          falling back to a thread pool when unavailable.
+                          Ignored with disk_cache=True, whose sidecars are
+                          read through the thread pool instead.
+        :param maxsize: Maximum number of templates kept in memory; the least
+                        recently used one is evicted beyond that. None = unbounded.
+        :param check_mtime: If True, every cache hit stats the prompt file and
+                            reloads just that prompt if its mtime changed.
+                            If False, changes are only seen after clear_cache().
         """
         self._folder = Path(folder)
         self._strict = strict
+        self._disk_cache = disk_cache
+        self._use_uring = use_uring
+        self._maxsize = maxsize
+        self._check_mtime = check_mtime
 
+        if maxsize is not None and maxsize < 1:
+            raise ValueError(f"maxsize must be a positive integer or None, got {maxsize!r}")
         if not self._folder.exists() or not self._folder.is_dir():
             raise NotADirectoryError(f"Prompt folder not found or not a directory: {self._folder}")
 
-        # Cache: name -> template string
-        self._cache: Dict[str, str] = {}
+        # Internal file access works on plain strings; Path is only kept for the
+        # public-facing attribute and messages.
+        self._prefix = os.fspath(self._folder) + os.sep
+        self._sidecar_prefix = self._prefix + _DISK_CACHE_DIR + os.sep
+
+        # Cache: name -> (template, compiled form or None to render via
+        # str.format). Entries are immutable tuples replaced whole, so a hit is
+        # a single dict read and needs no lock.
+        self._entries: Dict[str, Tuple[str, Optional[_Program]]] = {}
+        # Bookkeeping, stored column-wise: name -> slot (least recently used
+        # first), and per slot the file the entry came from and that file's
+        # mtime (ns) when it was read (0 unless check_mtime). Evicted slots are
+        # reused in place, so these are only changed and read under self._lock.
+        self._slots: OrderedDict[str, int] = OrderedDict()
+        self._paths: List[str] = []
+        # Plain ints: st_mtime_ns for dates past 2262 does not fit an int64.
+        self._mtimes: List[int] = []
+        # Like functools' pure-Python lru_cache, the counters are best-effort
+        # under concurrent use.
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+
+        # Index: name -> file path, built from one directory scan so lookups
+        # don't have to probe the filesystem. Refreshed by clear_cache().
+        self._index: Dict[str, str] = self._scan_folder()
+        # list_prompts() result, keyed by the folder's mtime (ns) when it was taken
+        self._listing: Optional[Tuple[int, List[str]]] = None
 
     # ------------------------------------------------------------------
     # Public API
@@ -130,11 +549,12 @@ class PromptManager:
         """
         List available prompt names (based on .yml /.yaml files in the folder).
         """
-        names = set()
-        for path in self._folder.iterdir():
-            if path.is_file() and path.suffix in {".yml", ".yaml"}:
-                names.add(path.stem)
-        return sorted(names)
+        # Adding, removing or renaming a file bumps the folder's mtime, so one
+        # stat() tells us whether the last scan is still valid.
+        mtime_ns = os.stat(self._prefix).st_mtime_ns
+        if self._listing is None or self._listing[0] != mtime_ns:
+            self._listing = (mtime_ns, sorted(self._scan_folder()))
+        return list(self._listing[1])
 
     def has_prompt(self, name: str) -> bool:
         """
@@ -147,16 +567,57 @@ class PromptManager:
         Get the raw template string for a given prompt name (without formatting).
         Loads from disk (and caches) if needed.
         """
-        if use_cache and name in self._cache:
-            return self._cache[name]
+        return self._lookup(name, use_cache)[0]
 
-        path = self._resolve_path(name)
-        if path is None:
-            raise PromptNotFoundError(f"Prompt '{name}' not found in folder {self._folder}")
+    def preload(self, names: Optional[Iterable[str]] = None) -> None:
+        """
+        Load several prompts into the cache at once, reading the files from a
+        thread pool so disk latency overlaps instead of adding up.
 
-        template = self._load_template_from_file(path)
-        self._cache[name] = template
-        return template
+        :param names: Prompt names to load. Defaults to every prompt in the folder.
+                      Names that are already cached are skipped.
+        :raises PromptNotFoundError: If a name given in `names` has no file.
+                                     Nothing is cached in that case.
+        """
+        explicit = names is not None
+        if names is None:
+            names = list(self._index)
+
+        pending: Dict[str, str] = {}
+        for name in names:
+            if name in self._entries or name in pending:
+                continue
+            path = self._resolve_path(name)
+            if path is None:
+                raise PromptNotFoundError(f"Prompt '{name}' not found in folder {self._folder}")
+            pending[name] = path
+        if not pending:
+            return
+
+        # io_uring only batches the YAML reads; with the disk cache on, the
+        # sidecars are what gets read, so the thread pool handles that case.
+        loaded = None
+        if self._use_uring and not self._disk_cache:
+            loaded = self._preload_uring(pending)
+        if loaded is None:
+            workers = min(32, (os.cpu_count() or 1) * 4, len(pending))
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                loaded = list(pool.map(self._load_indexed_template, pending, pending.values()))
+
+        # Load everything before caching anything, so a failure leaves the
+        # cache as it was.
+        entries: List[Tuple[str, str, str, int]] = []
+        for (name, path), result in zip(pending.items(), loaded):
+            if result is not None:
+                entries.append((name, result[0], path, result[1]))
+                continue
+            # Removed since the folder was indexed. A prompt asked for by name
+            # is looked for afresh (and must exist); otherwise it is skipped.
+            self._index.pop(name, None)
+            if explicit:
+                entries.append((name, *self._load_unindexed_template(name)))
+        for entry in entries:
+            self._store(*entry)
 
     def render(self, prompt_name: str, **params: Any) -> str:
         """
@@ -166,7 +627,9 @@ class PromptManager:
         :param params: Parameters to fill in `{placeholders}`.
         :return: Rendered string.
         """
-        template = self.get_template(prompt_name)
+        template, program = self._lookup(prompt_name)
+        if program is not None:
+            return self._render_program(prompt_name, program, params)
 
         if self._strict:
             # Strict mode: missing params raise KeyError -> PromptRenderError
@@ -183,43 +646,350 @@ class PromptManager:
                 ) from e
         else:
             # Non-strict: leave missing placeholders as-is
-            class DefaultDict(dict):
-                def __missing__(self, key: str) -> str:
-                    return "{%s}" % key
+            return template.format_map(_PassthroughDict(params))
 
-            return template.format_map(DefaultDict(**params))
+    def clear_cache(self, reindex: bool = True) -> None:
+        """
+        Clear the in-memory template cache (forces reload from disk next time).
 
-    def clear_cache(self) -> None:
-        """Clear the in-memory template cache (forces reload from disk next time)."""
-        self._cache.clear()
+        :param reindex: If True, also rescan the folder so added or removed
+                        prompt files are picked up.
+        """
+        # Swap in fresh containers, so a lookup holding the old ones can't see
+        # them half cleared.
+        with self._lock:
+            self._entries = {}
+            self._slots = OrderedDict()
+            self._paths = []
+            self._mtimes = []
+            self._hits = self._misses = 0
+        self._listing = None
+        if reindex:
+            self._index = self._scan_folder()
+
+    def cache_info(self) -> CacheInfo:
+        """
+        Report in-memory cache statistics, like functools.lru_cache's cache_info().
+        Hits and misses count get_template() lookups since the last clear_cache().
+        """
+        return CacheInfo(self._hits, self._misses, self._maxsize, len(self._entries))
 
     # ------------------------------------------------------------------
     # Internal helpers
     # ------------------------------------------------------------------
-    def _resolve_path(self, name: str) -> Optional[Path]:
+    def _lookup(self, name: str, use_cache: bool = True) -> Tuple[str, Optional[_Program]]:
+        """
+        Return prompt `name`'s template and compiled form, loading it from disk
+        if needed.
+        """
+        if use_cache:
+            if self._check_mtime:
+                entry = self._fresh_entry(name)
+            else:
+                entry = self._entries.get(name)
+            if entry is not None:
+                self._hits += 1
+                if self._maxsize is not None:
+                    with self._lock:
+                        # The prompt may have been evicted since it was read.
+                        if name in self._slots:
+                            self._slots.move_to_end(name)
+                return entry
+        self._misses += 1
+
+        # Index misses go straight to opening the file (see
+        # _load_unindexed_template) rather than stat-probing it first.
+        path = self._index.get(name)
+        if path is not None:
+            result = self._load_indexed_template(name, path)
+            if result is not None:
+                return self._store(name, result[0], path, result[1])
+            # Removed since the folder was indexed; look for it afresh.
+            self._index.pop(name, None)
+
+        return self._store(name, *self._load_unindexed_template(name))
+
+    def _fresh_entry(self, name: str) -> Optional[Tuple[str, Optional[_Program]]]:
+        """Return the cached entry for `name` if its file's mtime is unchanged."""
+        with self._lock:
+            slot = self._slots.get(name)
+            if slot is None:
+                return None
+            # Read together, so the entry matches the mtime it is checked by.
+            entry = self._entries[name]
+            path, mtime_ns = self._paths[slot], self._mtimes[slot]
+        # stat() outside the lock.
+        return entry if self._is_fresh(path, mtime_ns) else None
+
+    def _load_indexed_template(self, name: str, path: str) -> Optional[Tuple[str, int]]:
+        """
+        Load a prompt from its known path.
+
+        :return: The template and the file's mtime (0 unless check_mtime is set),
+                 or None if the file no longer exists (or is no longer a file).
+        """
+        try:
+            # Take the mtime before reading, so a concurrent edit can only
+            # cause a spurious reload later, never a stale entry.
+            mtime_ns = os.stat(path).st_mtime_ns if self._check_mtime else 0
+            return self._load_template(name, path), mtime_ns
+        except OSError as e:
+            # Removed, or replaced by something that isn't a file.
+            if e.errno in _NOT_A_FILE_ERRNOS:
+                return None
+            raise
+
+    def _preload_uring(self, pending: Dict[str, str]) -> Optional[List[Optional[Tuple[str, int]]]]:
+        """
+        preload() reads through io_uring; same results as _load_indexed_template
+        per prompt, or None if io_uring is unavailable.
+        """
+        mtimes: List[Optional[int]] = []
+        for path in pending.values():
+            try:
+                mtimes.append(os.stat(path).st_mtime_ns if self._check_mtime else 0)
+            except OSError as e:
+                if e.errno not in _NOT_A_FILE_ERRNOS:
+                    raise
+                mtimes.append(None)
+
+        contents = _read_files_uring(list(pending.values()))
+        if contents is None:
+            return None
+        return [
+            None if data is None or mtime_ns is None
+            else (self._parse_template(data, path), mtime_ns)
+            for path, data, mtime_ns in zip(pending.values(), contents, mtimes)
+        ]
+
+    def _render_program(self, prompt_name: str, program: _Program, params: Dict[str, Any]) -> str:
+        """Render a compiled template with the same semantics as render()."""
+        required, render_fn = program
+
+        # Check every placeholder up front so the error names all of them. The
+        # subset test allocates nothing; missing names are only listed on failure.
+        if self._strict and not required.keys() <= params.keys():
+            missing = [k for k in required if k not in params]
+            names = ", ".join(f"'{k}'" for k in missing)
+            plural = "s" if len(missing) > 1 else ""
+            raise PromptRenderError(
+                f"Missing parameter{plural} {names} for prompt '{prompt_name}'"
+            )
+
+        if not self._strict:
+            # Like format_map() in render(): errors propagate unwrapped.
+            return render_fn(params)
+        try:
+            return render_fn(params)
+        except Exception as e:
+            raise PromptRenderError(
+                f"Error rendering prompt '{prompt_name}': {e}"
+            ) from e
+
+    def _scan_folder(self) -> Dict[str, str]:
+        """
+        Map every prompt name in the folder to its file path in a single pass.
+        When both name.yml and name.yaml exist, the .yml file wins.
+        """
+        index: Dict[str, str] = {}
+        # scandir hands back d_type with each entry, so is_file() needs no stat().
+        with os.scandir(self._prefix) as it:
+            for entry in it:
+                filename = entry.name
+                if filename.endswith(".yml"):
+                    stem = filename[:-4]
+                elif filename.endswith(".yaml"):
+                    stem = filename[:-5]
+                    if stem in index:
+                        continue
+                else:
+                    continue
+                if stem and entry.is_file():
+                    index[stem] = entry.path
+        return index
+
+    def _resolve_path(self, name: str) -> Optional[str]:
         """
         Resolve a prompt name to a concrete file path (.yml or .yaml).
         Returns None if no such file exists.
+
+        Indexed names need no syscall; others (e.g. files created after start-up)
+        cost one stat() per candidate extension and are added to the index.
+        Used where only the path is needed (has_prompt, preload); loading a
+        template opens the file directly instead.
         """
-        candidates = [
-            self._folder / f"{name}.yml",
-            self._folder / f"{name}.yaml",
-        ]
-        for c in candidates:
-            if c.exists() and c.is_file():
-                return c
+        path = self._index.get(name)
+        if path is not None:
+            return path
+        for ext in (".yml", ".yaml"):
+            path = self._prefix + name + ext
+            try:
+                st = os.stat(path)
+            except OSError as e:
+                if e.errno in _NOT_A_FILE_ERRNOS:
+                    continue
+                raise
+            if stat.S_ISREG(st.st_mode):
+                self._index[name] = path
+                return path
         return None
 
+    def _load_template(self, name: str, path: str) -> str:
+        """Load a template from disk, going through the sidecar cache if enabled."""
+        if self._disk_cache:
+            return self._load_template_via_disk_cache(name, path)
+        return self._load_template_from_file(path)
+
+    def _load_unindexed_template(self, name: str) -> Tuple[str, str, int]:
+        """
+        Load a prompt that is missing from the index (e.g. created after start-up)
+        by opening name.yml, then name.yaml, directly; no stat() probing first.
+        Records the file in the index when found.
+
+        :return: The template, its file path and the file's mtime (0 unless
+                 check_mtime is set).
+        """
+        for ext in (".yml", ".yaml"):
+            path = self._prefix + name + ext
+            try:
+                with open(path, "rb") as f:
+                    # The disk cache keys on the mtime too, so take it from the
+                    # open file rather than stat()ing the path again later.
+                    if self._check_mtime or self._disk_cache:
+                        file_mtime_ns = os.fstat(f.fileno()).st_mtime_ns
+                    else:
+                        file_mtime_ns = 0
+                    content = f.read()
+            except OSError as e:
+                # Not a prompt, as for has_prompt().
+                if e.errno in _NOT_A_FILE_ERRNOS:
+                    continue
+                raise
+            break
+        else:
+            raise PromptNotFoundError(f"Prompt '{name}' not found in folder {self._folder}")
+
+        self._index[name] = path
+        if self._disk_cache:
+            template = self._load_template_via_disk_cache(name, path, content, file_mtime_ns)
+        else:
+            template = self._parse_template(content, path)
+        return template, path, file_mtime_ns if self._check_mtime else 0
+
+    def _is_fresh(self, path: str, mtime_ns: int) -> bool:
+        """Check whether a cached prompt's file still has the mtime it was read at."""
+        try:
+            return os.stat(path).st_mtime_ns == mtime_ns
+        except OSError:
+            return False
+
+    def _store(
+        self, name: str, template: str, path: str, mtime_ns: int = 0
+    ) -> Tuple[str, Optional[_Program]]:
+        """
+        Cache a freshly loaded template together with its compiled form.
+        Returns both, as _lookup() does.
+        """
+        entry = (template, _compile_template(template, name, self._strict))
+
+        with self._lock:
+            slot = self._slots.get(name)
+            if slot is None and self._maxsize is not None and len(self._slots) >= self._maxsize:
+                # Full: hand the least recently used prompt's slot to this one.
+                evicted, slot = self._slots.popitem(last=False)
+                del self._entries[evicted]
+                self._slots[name] = slot
+            if slot is None:
+                self._slots[name] = len(self._paths)
+                self._paths.append(path)
+                self._mtimes.append(mtime_ns)
+            else:
+                self._paths[slot] = path
+                self._mtimes[slot] = mtime_ns
+                if self._maxsize is not None:
+                    self._slots.move_to_end(name)
+            self._entries[name] = entry
+        return entry
+
+    def _load_template_via_disk_cache(
+        self,
+        name: str,
+        path: str,
+        content: Optional[bytes] = None,
+        mtime_ns: Optional[int] = None,
+    ) -> str:
+        """
+        Return the template from the on-disk sidecar if it was written for the
+        current mtime of `path`; otherwise parse the YAML and refresh the sidecar.
+
+        Callers that already read the file pass its `content` and `mtime_ns`
+        so it is neither stat()ed nor read a second time.
+        """
+        if mtime_ns is None:
+            mtime_ns = os.stat(path).st_mtime_ns
+        sidecar = self._sidecar_prefix + name + ".json"
+
+        try:
+            with open(sidecar, "rb") as f:
+                entry = _json_loads(f.read())
+            if entry["mtime_ns"] == mtime_ns and isinstance(entry["template"], str):
+                return entry["template"]
+        except (OSError, ValueError, KeyError, TypeError):
+            # Missing, unreadable or corrupt sidecar: fall through and rebuild it.
+            pass
+
+        if content is None:
+            template = self._load_template_from_file(path)
+        else:
+            template = self._parse_template(content, path)
+
+        # Write to a uniquely named temp file and swap it in, so readers never see
+        # a partial file and concurrent writers (other managers, threads or
+        # processes) never share one. The disk cache is best-effort: a read-only
+        # folder just means no sidecar.
+        tmp = None
+        try:
+            # Nested names ("emails/welcome") mirror their folders under .cache/.
+            sidecar_dir, base = os.path.split(sidecar)
+            os.makedirs(sidecar_dir, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(prefix=base[:-5] + ".", suffix=".tmp", dir=sidecar_dir)
+            with os.fdopen(fd, "wb") as f:
+                f.write(_json_dumps({"mtime_ns": mtime_ns, "template": template}))
+            os.replace(tmp, sidecar)
+        except OSError:
+            if tmp is not None:
+                try:
+                    os.unlink(tmp)
+                except OSError:
+                    pass
+        return template
+
     @staticmethod
-    def _load_template_from_file(path: Path) -> str:
+    def _load_template_from_file(path: str) -> str:
         """
         Load the template string from a YAML file.
+        """
+        with open(path, "rb") as f:
+            return PromptManager._parse_template(f.read(), path)
+
+    @staticmethod
+    def _parse_template(content: bytes, path: str) -> str:
+        """
+        Extract the template string from the raw bytes of a YAML file.
         Supports either:
           - raw string
           - mapping with 'template' key
         """
-        with path.open("r", encoding="utf-8") as f:
-            data = yaml.safe_load(f)
+        # Most prompts are one line of text or a `template:` line plus simple
+        # metadata; skip YAML for those.
+        template = _sniff_plain_document(content)
+        if template is None:
+            template = _sniff_template_key(content)
+        if template is not None:
+            return template
+
+        # libyaml decodes UTF-8 itself, so hand it the raw bytes.
+        data = yaml.load(content, Loader=_SafeLoader)
 
         # Case 1: file is just a string
         if isinstance(data, str):
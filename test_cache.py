@@ -0,0 +1,320 @@
+"""
+Tests for PromptManager's caching: preload(), the LRU bound, check_mtime,
+the list_prompts() memo, lookups of unindexed names and the disk cache.
+
+Run with `python -m unittest test_cache` (or pytest).
+"""
+
+import errno
+import os
+import tempfile
+import threading
+import unittest
+import unittest.mock
+
+import prompt_manager_yml as pm
+
+try:
+    import liburing
+except ImportError:  # optional, like in prompt_manager_yml
+    liburing = None
+
+
+class CacheTestCase(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.folder = tmp.name
+
+    def write(self, name, text, ext=".yml"):
+        path = os.path.join(self.folder, name + ext)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        return path
+
+
+class PreloadTest(CacheTestCase):
+    def setUp(self):
+        super().setUp()
+        self.write("a", "template: A {x}\n")
+        self.gone = self.write("b", "template: B {x}\n")
+        self.manager = pm.PromptManager(self.folder)
+        os.remove(self.gone)  # removed after the folder was indexed
+
+    def test_all_skips_removed_prompts(self):
+        self.manager.preload()
+        self.assertEqual(self.manager.cache_info().currsize, 1)
+        self.assertEqual(self.manager.render("a", x=1), "A 1")
+        self.assertFalse(self.manager.has_prompt("b"))
+
+    def test_named_removed_prompt_raises_and_caches_nothing(self):
+        with self.assertRaises(pm.PromptNotFoundError):
+            self.manager.preload(["a", "b"])
+        self.assertEqual(self.manager.cache_info().currsize, 0)
+
+    def test_named_prompt_found_under_other_extension(self):
+        self.write("b", "template: B2 {x}\n", ext=".yaml")
+        self.manager.preload(["a", "b"])
+        self.assertEqual(self.manager.cache_info().currsize, 2)
+        self.assertEqual(self.manager.render("b", x=1), "B2 1")
+
+    def test_uring_preload_goes_through_the_disk_cache(self):
+        manager = pm.PromptManager(self.folder, disk_cache=True, use_uring=True)
+        manager.preload()
+        sidecars = os.listdir(os.path.join(self.folder, pm._DISK_CACHE_DIR))
+        self.assertEqual(sidecars, ["a.json"])
+
+
+@unittest.skipUnless(liburing and pm.sys.platform.startswith("linux"), "needs liburing on Linux")
+class UringPreloadTest(CacheTestCase):
+    def setUp(self):
+        super().setUp()
+        for i in range(5):
+            self.write(f"p{i}", f"template: P{i} {{x}}\n")
+        self.manager = pm.PromptManager(self.folder, use_uring=True)
+        if pm._read_files_uring([self.manager._index["p0"]]) is None:
+            self.skipTest("io_uring refused by the kernel")
+
+    def test_reads_every_prompt(self):
+        with unittest.mock.patch.object(pm, "ThreadPoolExecutor",
+                                        side_effect=AssertionError("thread pool")):
+            self.manager.preload()
+        self.assertEqual(self.manager.cache_info().currsize, 5)
+        for i in range(5):
+            self.assertEqual(self.manager.get_template(f"p{i}"), f"P{i} {{x}}")
+
+    def test_failed_reads_are_skipped_like_the_thread_pool(self):
+        # Indexed as files, then replaced: the read itself fails with EISDIR.
+        for name in ("p1", "p3"):
+            path = os.path.join(self.folder, name + ".yml")
+            os.remove(path)
+            os.mkdir(path)
+        contents = pm._read_files_uring(list(self.manager._index.values()))
+        self.assertEqual(sum(data is None for data in contents), 2)
+
+        self.manager.preload()
+        self.assertEqual(sorted(self.manager._slots), ["p0", "p2", "p4"])
+
+
+class LruTest(CacheTestCase):
+    def setUp(self):
+        super().setUp()
+        for name in "abcd":
+            self.write(name, f"template: {name.upper()} {{x}}\n")
+        self.manager = pm.PromptManager(self.folder, maxsize=2)
+
+    def cached(self):
+        return list(self.manager._slots)
+
+    def test_least_recently_used_is_evicted(self):
+        for name in "abc":
+            self.manager.get_template(name)
+        self.assertEqual(self.cached(), ["b", "c"])
+        self.manager.get_template("d")
+        self.assertEqual(self.cached(), ["c", "d"])
+        self.assertEqual(self.manager.render("b", x=1), "B 1")
+
+    def test_hit_refreshes_recency(self):
+        self.manager.get_template("a")
+        self.manager.get_template("b")
+        self.manager.get_template("a")
+        self.manager.get_template("c")
+        self.assertEqual(self.cached(), ["a", "c"])
+
+    def test_cache_info(self):
+        self.manager.get_template("a")
+        self.manager.get_template("a")
+        self.manager.get_template("b")
+        self.manager.get_template("c")
+        self.assertEqual(self.manager.cache_info(), pm.CacheInfo(1, 3, 2, 2))
+        self.manager.get_template("a", use_cache=False)
+        self.assertEqual(self.manager.cache_info(), pm.CacheInfo(1, 4, 2, 2))
+
+    def test_clear_cache_resets_counters(self):
+        self.manager.get_template("a")
+        self.manager.get_template("a")
+        self.manager.clear_cache()
+        self.assertEqual(self.manager.cache_info(), pm.CacheInfo(0, 0, 2, 0))
+        self.assertEqual(self.manager.render("a", x=1), "A 1")
+        self.assertEqual(self.manager.cache_info(), pm.CacheInfo(0, 1, 2, 1))
+
+    def test_invalid_maxsize(self):
+        with self.assertRaises(ValueError):
+            pm.PromptManager(self.folder, maxsize=0)
+
+
+class CheckMtimeTest(CacheTestCase):
+    def rewrite(self, path, text):
+        st = os.stat(path)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        # Don't depend on the filesystem's timestamp granularity.
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+    def test_rewritten_prompt_is_reloaded(self):
+        path = self.write("a", "template: Old {x}\n")
+        manager = pm.PromptManager(self.folder, check_mtime=True)
+        self.assertEqual(manager.render("a", x=1), "Old 1")
+        self.assertEqual(manager.render("a", x=1), "Old 1")
+        self.rewrite(path, "template: New {x}\n")
+        self.assertEqual(manager.render("a", x=1), "New 1")
+        self.assertEqual(manager.cache_info().hits, 1)
+
+    def test_without_check_mtime_changes_wait_for_clear_cache(self):
+        path = self.write("a", "template: Old {x}\n")
+        manager = pm.PromptManager(self.folder)
+        manager.get_template("a")
+        self.rewrite(path, "template: New {x}\n")
+        self.assertEqual(manager.get_template("a"), "Old {x}")
+        manager.clear_cache()
+        self.assertEqual(manager.get_template("a"), "New {x}")
+
+    def test_far_future_mtime(self):
+        path = self.write("a", "template: A\n")
+        self.write("b", "template: B\n")
+        mtime_ns = 10413792000000000000  # 2300-01-01, past the int64 range
+        try:
+            os.utime(path, ns=(mtime_ns, mtime_ns))
+        except (OSError, OverflowError):
+            self.skipTest("filesystem can't store the timestamp")
+        manager = pm.PromptManager(self.folder, check_mtime=True)
+        for _ in range(2):
+            self.assertEqual(manager.get_template("a"), "A")
+            self.assertEqual(manager.get_template("b"), "B")
+        self.assertEqual(manager.cache_info().hits, 2)
+
+
+class ListPromptsTest(CacheTestCase):
+    def touch_folder(self):
+        # Adding or removing a file already bumps the folder's mtime; make sure
+        # it moves even on coarse-grained filesystems.
+        st = os.stat(self.folder)
+        os.utime(self.folder, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+    def test_memo_follows_added_and_removed_files(self):
+        self.write("a", "template: A\n")
+        gone = self.write("b", "template: B\n")
+        manager = pm.PromptManager(self.folder)
+        self.assertEqual(manager.list_prompts(), ["a", "b"])
+
+        self.write("c", "template: C\n", ext=".yaml")
+        os.remove(gone)
+        self.touch_folder()
+        self.assertEqual(manager.list_prompts(), ["a", "c"])
+
+    def test_result_is_a_copy(self):
+        self.write("a", "template: A\n")
+        manager = pm.PromptManager(self.folder)
+        manager.list_prompts().append("x")
+        self.assertEqual(manager.list_prompts(), ["a"])
+
+
+class LookupTest(CacheTestCase):
+    def test_name_under_a_file_is_not_found(self):
+        self.write("top", "template: Top\n")
+        manager = pm.PromptManager(self.folder)
+        self.assertFalse(manager.has_prompt("top.yml/x"))
+        with self.assertRaises(pm.PromptNotFoundError):
+            manager.get_template("top.yml/x")
+
+    def test_indexed_file_replaced_by_directory_is_not_found(self):
+        path = self.write("a", "template: A\n")
+        manager = pm.PromptManager(self.folder)
+        os.remove(path)
+        os.mkdir(path)
+        with self.assertRaises(pm.PromptNotFoundError):
+            manager.get_template("a")
+
+    def test_io_errors_propagate(self):
+        path = self.write("a", "template: A\n")
+        manager = pm.PromptManager(self.folder)
+        real_open = open
+
+        def emfile(file, *args, **kwargs):
+            if file == path or file.startswith(os.path.join(self.folder, "late")):
+                raise OSError(errno.EMFILE, "Too many open files", file)
+            return real_open(file, *args, **kwargs)
+
+        with unittest.mock.patch("builtins.open", emfile):
+            for name in ("a", "late"):  # indexed, unindexed
+                with self.assertRaises(OSError) as cm:
+                    manager.get_template(name)
+                self.assertEqual(cm.exception.errno, errno.EMFILE)
+        self.assertEqual(manager.get_template("a"), "A")
+        self.assertEqual(manager._index["a"], path)
+
+
+class DiskCacheTest(CacheTestCase):
+    def test_unindexed_prompt_is_read_once(self):
+        manager = pm.PromptManager(self.folder, disk_cache=True)
+        path = self.write("late", "template: Late {x}\n")  # not in the index
+        opened = []
+        real_open = open
+
+        def spy(file, *args, **kwargs):
+            opened.append(file)
+            return real_open(file, *args, **kwargs)
+
+        real_stat = os.stat
+
+        def no_stat(file, *args, **kwargs):
+            self.assertNotEqual(file, path)
+            return real_stat(file, *args, **kwargs)
+
+        with unittest.mock.patch("builtins.open", spy), \
+                unittest.mock.patch("os.stat", no_stat):
+            self.assertEqual(manager.render("late", x=1), "Late 1")
+        self.assertEqual(opened.count(path), 1)
+
+        sidecar = os.path.join(self.folder, pm._DISK_CACHE_DIR, "late.json")
+        with open(sidecar, "rb") as f:
+            entry = pm._json_loads(f.read())
+        self.assertEqual(entry["mtime_ns"], os.stat(path).st_mtime_ns)
+        self.assertEqual(entry["template"], "Late {x}")
+
+    def test_nested_prompt_gets_a_sidecar(self):
+        os.mkdir(os.path.join(self.folder, "emails"))
+        self.write(os.path.join("emails", "welcome"), "template: Hi {x}\n")
+        pm.PromptManager(self.folder, disk_cache=True).render("emails/welcome", x=1)
+
+        sidecar = os.path.join(self.folder, pm._DISK_CACHE_DIR, "emails", "welcome.json")
+        with open(sidecar, "rb") as f:
+            self.assertEqual(pm._json_loads(f.read())["template"], "Hi {x}")
+        self.assertEqual(os.listdir(os.path.dirname(sidecar)), ["welcome.json"])
+        # A fresh manager is served from the sidecar.
+        manager = pm.PromptManager(self.folder, disk_cache=True)
+        with unittest.mock.patch.object(pm.PromptManager, "_parse_template",
+                                        side_effect=AssertionError("parsed")):
+            self.assertEqual(manager.render("emails/welcome", x=2), "Hi 2")
+
+
+class ConcurrencyTest(CacheTestCase):
+    def test_bounded_cache_never_returns_another_prompt(self):
+        for i in range(200):
+            self.write(f"p{i}", f"template: T{i} {{x}}\n")
+        manager = pm.PromptManager(self.folder, maxsize=20)
+        wrong, errors = [], []
+
+        def work(seed):
+            for j in range(500):
+                i = (j * 7 + seed * 13) % 200
+                try:
+                    if manager.get_template(f"p{i}") != f"T{i} {{x}}":
+                        wrong.append(i)
+                    if manager.render(f"p{i}", x=1) != f"T{i} 1":
+                        wrong.append(i)
+                except Exception as e:
+                    errors.append(e)
+
+        threads = [threading.Thread(target=work, args=(k,)) for k in range(16)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(errors, [])
+        self.assertEqual(wrong, [])
+        self.assertEqual(manager.cache_info().currsize, 20)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,187 @@
+"""
+Differential tests for the YAML-free fast paths in prompt_manager_yml
+(plain one-line documents and `template:` line extraction).
+
+Whenever a fast path accepts a file, its template must be exactly what the
+YAML parser would have produced; when it can't be sure, it must fall back
+(return None). Every accepted input is checked against yaml.load with both the
+pure-Python SafeLoader and, when available, libyaml's CSafeLoader.
+
+Run with `python -m unittest test_prompt_parsing` (or pytest).
+"""
+
+import random
+import unittest
+
+import yaml
+
+import prompt_manager_yml as pm
+
+LOADERS = [yaml.SafeLoader] + ([yaml.CSafeLoader] if yaml.__with_libyaml__ else [])
+
+FUZZ_CASES = 100000
+
+
+def yaml_template(content: bytes, loader) -> object:
+    """What the YAML path extracts from a prompt file, or an ('error', ...) marker."""
+    try:
+        data = yaml.load(content, Loader=loader)
+    except (yaml.YAMLError, ValueError) as e:
+        return ("error", type(e).__name__)
+    if isinstance(data, str):
+        return data
+    if isinstance(data, dict) and isinstance(data.get("template"), str):
+        return data["template"]
+    return ("error", "unsupported")
+
+
+class DifferentialMixin:
+    sniff = None
+
+    def assertMatchesYaml(self, content: bytes) -> bool:
+        """Check one input; returns whether the fast path accepted it."""
+        got = type(self).sniff(content)
+        if got is None:
+            return False
+        for loader in LOADERS:
+            self.assertEqual(
+                got, yaml_template(content, loader),
+                f"fast path disagrees with {loader.__name__} on {content!r}",
+            )
+        return True
+
+
+class PlainDocumentTest(DifferentialMixin, unittest.TestCase):
+    sniff = staticmethod(pm._sniff_plain_document)
+
+    SAMPLES = [
+        b"Hello {name}, welcome to our platform!\n",
+        b"---\nThis one has no parameters.\n",
+        b"---  \nHi {name}\n\n",
+        b"  Indented text\r\n",
+        b"Tell me about {topic}. Be brief.",
+        b"It's {name}'s turn",
+        b"Price: {price}",
+        b"50% off",
+        b"#hashtag {x}",
+        b"{name} first",
+        b"  ---\nHello {name}\n",
+        b"---\n  ---\n",
+        b"yes",
+        b"123",
+        b"~",
+        b"2001-12-14",
+        b"Hello\nworld\n",
+        b"key: value\n",
+        b"a # comment",
+        b"\xef\xbb\xbfHello",
+        b"tab\there",
+    ]
+
+    def test_sample_prompts(self):
+        accepted = [s for s in self.SAMPLES if self.assertMatchesYaml(s)]
+        # The common shapes must actually take the fast path.
+        self.assertIn(b"Hello {name}, welcome to our platform!\n", accepted)
+        self.assertIn(b"---\nThis one has no parameters.\n", accepted)
+
+    def test_indented_marker_is_text(self):
+        self.assertIsNone(pm._sniff_plain_document(b"  ---\nHello {name}\n"))
+
+    def test_fuzz(self):
+        rng = random.Random(20261014)
+        atoms = list("ab {}:#-?,[]&*!|>'\"%@`.\\\t\r\n09eE+_~ ") + [
+            "---", "...", "\n---\n", "\n  ---\n", "\n ", "yes", "null", "0x1F",
+            "1_000", "2001-12-14", "é", "\xa0", "\x85", "Hello {name}",
+        ]
+        accepted = 0
+        for _ in range(FUZZ_CASES):
+            text = "".join(rng.choice(atoms) for _ in range(rng.randint(0, 10)))
+            accepted += self.assertMatchesYaml(text.encode("utf-8"))
+        self.assertGreater(accepted, FUZZ_CASES // 20)
+
+
+class TemplateKeyTest(DifferentialMixin, unittest.TestCase):
+    sniff = staticmethod(pm._sniff_template_key)
+
+    SAMPLES = [
+        b'template: "Hello {name}, welcome to {app_name}!"\ndescription: "Basic welcome message"\n',
+        b"---\ntemplate: Hello {name}\ndescription: Greeting\n",
+        b"# comment\ntemplate: 'It''s {name}'\nversion: 2\n",
+        b"description: |\n  Long text\n    with template: inside\n\ntemplate: Hi {x}\n",
+        b"description: >-\n  folded\ntemplate: \"\"\n",
+        b"template: Hello {name}\r\ndescription: x\r\n",
+        b"description: 0x_\ntemplate: hi\n",
+        b"description: 0b_\ntemplate: hi\n",
+        b"ratio: 1.5\nenabled: yes\nnothing: ~\ntemplate: hi\n",
+        b"when: 2001-13-45\ntemplate: hi\n",
+        b"<<: {template: x}\ntemplate: hi\n",
+        b"template: hi\ntemplate: again\n",
+        b"template: hi\n  continued\n",
+        b'template: "a\\nb"\n',
+        b"template: |\n  block\n",
+        b"template: 12\n",
+        b"template: &a hi\n",
+        b"meta:\n  template: nested\ntemplate: hi\n",
+        b"description: \"open\ntemplate: x\"\n",
+        b"template: hi # comment\n",
+        b"template:\thi\n",
+        b"template: hi\n---\ntemplate: two\n",
+    ]
+
+    def test_sample_prompts(self):
+        accepted = [s for s in self.SAMPLES if self.assertMatchesYaml(s)]
+        self.assertIn(self.SAMPLES[0], accepted)
+        self.assertIn(self.SAMPLES[3], accepted)
+
+    def test_metadata_that_fails_to_load_is_left_to_yaml(self):
+        for content in (b"description: 0x_\ntemplate: hi\n", b"description: 0b_\ntemplate: hi\n"):
+            self.assertIsNone(pm._sniff_template_key(content))
+
+    def test_fuzz(self):
+        rng = random.Random(20261015)
+        atoms = list("ab {}:#-?,[]&*!|>'\"%@`.\\09 ") + [
+            "é", "yes", "null", "1.5", "0x_", "0b_", "0x1F", "1_0", "._", "1:30",
+            "2001-12-14", "2001-13-45", "''", ": ", " #", "~", "\t", "\r", "<<", "=",
+        ]
+
+        def text(n):
+            return "".join(rng.choice(atoms) for _ in range(rng.randint(0, n)))
+
+        def value():
+            r = rng.random()
+            if r < 0.3:
+                return text(6)
+            if r < 0.45:
+                return '"' + text(5) + '"'
+            if r < 0.6:
+                return "'" + text(5) + "'"
+            if r < 0.7:
+                return rng.choice(["|", ">", "|-", ">+", "|2", ""])
+            return "Hello {name}, welcome to " + rng.choice(["x", "{app}", "our app"])
+
+        keys = ["template", "template", "description", "desc-x", "yes", "a b", "-k", "<<", "1"]
+
+        def line():
+            r = rng.random()
+            if r < 0.55:
+                sep = rng.choice([":", ": ", ":  ", " :"])
+                return rng.choice(keys) + sep + value()
+            if r < 0.7:
+                return " " * rng.randint(1, 4) + text(6)
+            if r < 0.8:
+                return rng.choice(["", " ", "---", "  ---", "...", "# c", "- a", "%YAML 1.1"])
+            return text(8)
+
+        accepted = 0
+        for _ in range(FUZZ_CASES):
+            lines = [line() for _ in range(rng.randint(1, 5))]
+            if rng.random() < 0.5:
+                # Bias towards realistic files: a template line plus metadata.
+                lines.insert(rng.randint(0, len(lines)), "template: " + value())
+            content = "\n".join(lines) + rng.choice(["", "\n", "\r\n"])
+            accepted += self.assertMatchesYaml(content.encode("utf-8"))
+        self.assertGreater(accepted, FUZZ_CASES // 100)
+
+
+if __name__ == "__main__":
+    unittest.main()
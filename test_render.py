@@ -0,0 +1,137 @@
+"""
+Differential tests for compiled templates in prompt_manager_yml.
+
+Templates made of plain `{name}` placeholders are rendered by a generated
+function instead of str.format; the output (and, in strict mode, the missing
+parameter error) must be exactly what str.format / format_map would give.
+
+Run with `python -m unittest test_render` (or pytest).
+"""
+
+import enum
+import os
+import random
+import tempfile
+import unittest
+
+import yaml
+
+import prompt_manager_yml as pm
+
+
+class Color(str, enum.Enum):
+    # str() and format() disagree for mixed-in enums on some Python versions.
+    RED = "red"
+
+
+class Shout:
+    def __str__(self):
+        return "str"
+
+    def __format__(self, spec):
+        return "format"
+
+
+class Boom:
+    def __format__(self, spec):
+        raise RuntimeError("boom")
+
+
+VALUES = [1, 1.5, -0.0, True, None, "x", "", "{y}", b"b", Color.RED, Shout(), [1], {"k": 2}]
+
+
+def reference(template, params, strict):
+    """What render() does without a compiled template."""
+    if not strict:
+        return template.format_map(pm._PassthroughDict(params))
+    try:
+        return template.format(**params)
+    except KeyError as e:
+        return ("missing", e.args[0])
+
+
+class CompiledTemplateTest(unittest.TestCase):
+    def assertRendersLikeFormat(self, template, params, strict):
+        program = pm._compile_template(template, "t", strict)
+        self.assertIsNotNone(program, template)
+        required, render_fn = program
+        expected = reference(template, params, strict)
+        if strict and required.keys() - params.keys():
+            self.assertIsInstance(expected, tuple, template)
+            return
+        self.assertEqual(render_fn(params), expected, f"{template!r} with {params!r}")
+
+    def test_values_render_with_format(self):
+        for strict in (True, False):
+            for value in VALUES:
+                self.assertRendersLikeFormat("a {x} b", {"x": value}, strict)
+
+    def test_unsupported_fields_are_not_compiled(self):
+        for template in ("{x:>4}", "{x!r}", "{x.y}", "{x[0]}", "{0}", "{}", "{x", "}"):
+            self.assertIsNone(pm._compile_template(template, "t", True), template)
+
+    def test_fuzz(self):
+        rng = random.Random(20261016)
+        atoms = ["a", " ", "é", "{{", "}}", "{x}", "{y}", "{x_1}", "\n", "'", '"', "\\"]
+        names = ["x", "y", "x_1"]
+        for _ in range(20000):
+            template = "".join(rng.choice(atoms) for _ in range(rng.randint(0, 8)))
+            params = {k: rng.choice(VALUES) for k in names if rng.random() < 0.7}
+            for strict in (True, False):
+                self.assertRendersLikeFormat(template, params, strict)
+
+
+class RenderTest(unittest.TestCase):
+    def manager_with(self, templates, strict):
+        """A PromptManager over a temporary folder holding `templates` by name."""
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        for name, template in templates.items():
+            with open(os.path.join(tmp.name, name + ".yml"), "w", encoding="utf-8") as f:
+                yaml.safe_dump({"template": template}, f)
+        return pm.PromptManager(tmp.name, strict=strict)
+
+    def test_render_matches_format(self):
+        templates = {"compiled": "Hi {name}, {n}!", "fallback": "Hi {name}, {n:>3}!"}
+        for strict in (True, False):
+            manager = self.manager_with(templates, strict)
+            for name, template in templates.items():
+                for value in VALUES[:3] + [Color.RED, Shout()]:
+                    params = {"name": value, "n": 7}
+                    self.assertEqual(
+                        manager.render(name, **params), reference(template, params, strict)
+                    )
+
+    def test_non_strict_keeps_missing_placeholders(self):
+        manager = self.manager_with({"p": "Hi {name}, {n}!"}, strict=False)
+        self.assertEqual(manager.render("p", n=1), "Hi {name}, 1!")
+
+    def test_format_errors_match_fallback(self):
+        templates = {"compiled": "Hi {name}!", "fallback": "Hi {name:>3}!"}
+        for strict, error in ((True, pm.PromptRenderError), (False, RuntimeError)):
+            manager = self.manager_with(templates, strict)
+            for name in templates:
+                with self.assertRaises(error) as cm:
+                    manager.render(name, name=Boom())
+                self.assertIs(type(cm.exception), error, (name, strict))
+
+    def test_missing_parameter_message(self):
+        templates = {"compiled": "Hi {name}, {n}!", "fallback": "Hi {name}, {n:>3}!"}
+        manager = self.manager_with(templates, strict=True)
+        messages = []
+        for name in templates:
+            with self.assertRaises(pm.PromptRenderError) as cm:
+                manager.render(name, n=1)
+            messages.append(str(cm.exception).replace(f"'{name}'", "'p'"))
+        self.assertEqual(messages[0], messages[1])
+        self.assertEqual(messages[0], "Missing parameter 'name' for prompt 'p'")
+
+        with self.assertRaises(pm.PromptRenderError) as cm:
+            manager.render("compiled")
+        self.assertEqual(
+            str(cm.exception), "Missing parameters 'name', 'n' for prompt 'compiled'"
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()